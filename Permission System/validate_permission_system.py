@@ -4,26 +4,86 @@ Permission System Schema Validator
 Validates the permission system tables and structure in the PostgreSQL schema
 """
 
-import re
+import mmap
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-def validate_permission_system(schema_file_path):
-    """Validate the permission system implementation in the schema file"""
-    
-    print("=== PERMISSION SYSTEM SCHEMA VALIDATION ===\n")
-    
-    try:
-        with open(schema_file_path, 'r') as f:
-            content = f.read()
-    except FileNotFoundError:
-        print(f"❌ Schema file not found: {schema_file_path}")
-        return False
+try:
+    import regex as re
+except ImportError:
+    import re
+
+try:
+    # Optional linear-time DFA engine for the schema-wide scans
+    import re2 as scan_re
+except ImportError:
+    scan_re = re
+
+# Inline (?i) flags keep these patterns portable between re and re2. They are
+# bytes patterns so the schema can be scanned straight from a memory map.
+# Tables, functions and indexes share one CREATE scan, keyed by the kind group.
+# The captured name skips CONCURRENTLY and any schema qualifier such as public.
+CREATE_RE = scan_re.compile(
+    rb'(?i)CREATE\s+(?:OR REPLACE\s+|UNIQUE\s+)?(TABLE|FUNCTION|INDEX)\s+'
+    rb'(?:CONCURRENTLY\s+)?(?:IF NOT EXISTS\s+)?(?:\w+\.)?(\w+)'
+)
+FK_RE = scan_re.compile(rb'(?i)FOREIGN KEY\s*\(([^)]+)\)\s*REFERENCES\s+(\w+)')
+INSERT_RE = scan_re.compile(rb'(?i)INSERT INTO\s+(\w+)([^;]*)')
+
+@lru_cache(maxsize=None)
+def _value_re(fragments):
+    # Fragments are literal text expected in order; escaping keeps names like
+    # foo.bar from being read as regex syntax
+    return re.compile('.*'.join(map(re.escape, fragments)), re.IGNORECASE)
+
+def _name(raw):
+    # \w on bytes only matches ASCII, so identifiers always decode cleanly
+    return raw.decode('ascii').lower()
+
+def parse_schema(content):
+    """Extract tables, foreign keys, functions, indexes and inserts from schema bytes"""
+    created = {'TABLE': set(), 'FUNCTION': set(), 'INDEX': set()}
+    for match in CREATE_RE.finditer(content):
+        created[match.group(1).decode('ascii').upper()].add(_name(match.group(2)))
+
+    fks = set()
+    for match in FK_RE.finditer(content):
+        ref_table = _name(match.group(2))
+        for column in match.group(1).split(b','):
+            fks.add((column.strip().decode('utf-8').lower(), ref_table))
+
+    inserts = {}
+    for match in INSERT_RE.finditer(content):
+        body = match.group(2).decode('utf-8', errors='replace')
+        inserts.setdefault(_name(match.group(1)), []).append(body)
+
+    return {
+        'tables': created['TABLE'],
+        'fks': fks,
+        'functions': created['FUNCTION'],
+        'indexes': created['INDEX'],
+        'inserts': inserts,
+    }
+
+def load_schema(schema_file_path):
+    """Parse the schema file into the structure returned by parse_schema"""
+    # Only the extracted names and INSERT bodies are ever decoded
+    with open(schema_file_path, 'rb') as f:
+        # mmap rejects empty files
+        if os.fstat(f.fileno()).st_size == 0:
+            return parse_schema(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return parse_schema(mm)
+
+def _validate_permission_system(schema, out):
+    """Run the permission checks, appending report lines to out"""
     
     validation_results = []
     
     # Test 1: Check if all permission tables exist
-    print("1. Checking permission table definitions...")
+    out.append("1. Checking permission table definitions...")
     required_tables = [
         'permission_groups',
         'permissions', 
@@ -33,16 +93,15 @@ def validate_permission_system(schema_file_path):
     ]
     
     for table in required_tables:
-        pattern = rf'CREATE TABLE.*{table}\s*\('
-        if re.search(pattern, content, re.IGNORECASE):
-            print(f"   ✅ {table} table found")
+        if table in schema['tables']:
+            out.append(f"   ✅ {table} table found")
             validation_results.append(True)
         else:
-            print(f"   ❌ {table} table missing")
+            out.append(f"   ❌ {table} table missing")
             validation_results.append(False)
     
     # Test 2: Check for foreign key constraints
-    print("\n2. Checking foreign key constraints...")
+    out.append("\n2. Checking foreign key constraints...")
     fk_checks = [
         ('permissions', 'permission_groups', 'group_id'),
         ('role_permissions', 'roles', 'role_id'),
@@ -52,16 +111,15 @@ def validate_permission_system(schema_file_path):
     ]
     
     for table, ref_table, column in fk_checks:
-        pattern = rf'FOREIGN KEY.*{column}.*REFERENCES\s+{ref_table}'
-        if re.search(pattern, content, re.IGNORECASE):
-            print(f"   ✅ {table}.{column} → {ref_table} constraint found")
+        if (column, ref_table) in schema['fks']:
+            out.append(f"   ✅ {table}.{column} → {ref_table} constraint found")
             validation_results.append(True)
         else:
-            print(f"   ❌ {table}.{column} → {ref_table} constraint missing")
+            out.append(f"   ❌ {table}.{column} → {ref_table} constraint missing")
             validation_results.append(False)
     
     # Test 3: Check for helper functions
-    print("\n3. Checking permission helper functions...")
+    out.append("\n3. Checking permission helper functions...")
     required_functions = [
         'employee_has_permission',
         'get_employee_permissions',
@@ -72,16 +130,15 @@ def validate_permission_system(schema_file_path):
     ]
     
     for func in required_functions:
-        pattern = rf'CREATE.*FUNCTION.*{func}\s*\('
-        if re.search(pattern, content, re.IGNORECASE):
-            print(f"   ✅ {func}() function found")
+        if func in schema['functions']:
+            out.append(f"   ✅ {func}() function found")
             validation_results.append(True)
         else:
-            print(f"   ❌ {func}() function missing")
+            out.append(f"   ❌ {func}() function missing")
             validation_results.append(False)
     
     # Test 4: Check for performance indexes
-    print("\n4. Checking permission system indexes...")
+    out.append("\n4. Checking permission system indexes...")
     expected_indexes = [
         'idx_employee_roles_employee_active',
         'idx_employee_roles_role_active', 
@@ -93,62 +150,75 @@ def validate_permission_system(schema_file_path):
     ]
     
     for idx in expected_indexes:
-        pattern = rf'CREATE.*INDEX.*{idx}'
-        if re.search(pattern, content, re.IGNORECASE):
-            print(f"   ✅ {idx} index found")
+        if idx in schema['indexes']:
+            out.append(f"   ✅ {idx} index found")
             validation_results.append(True)
         else:
-            print(f"   ❌ {idx} index missing")
+            out.append(f"   ❌ {idx} index missing")
             validation_results.append(False)
     
     # Test 5: Check for sample data
-    print("\n5. Checking sample permission data...")
+    out.append("\n5. Checking sample permission data...")
     sample_data_checks = [
-        ('permission_groups', 'System Administration'),
-        ('permissions', 'CREATE_ORDER'),
-        ('permissions', 'PROCESS_REFUND'),
-        ('roles', 'Manager'),
-        ('roles', 'Barista'),
-        ('role_permissions', 'role_id.*permission_id')
+        ('permission_groups', ('System Administration',)),
+        ('permissions', ('CREATE_ORDER',)),
+        ('permissions', ('PROCESS_REFUND',)),
+        ('roles', ('Manager',)),
+        ('roles', ('Barista',)),
+        ('role_permissions', ('role_id', 'permission_id'))
     ]
     
-    for table, check_value in sample_data_checks:
-        if 'role_id.*permission_id' in check_value:
-            # Special case for role_permissions insert
-            pattern = rf'INSERT INTO {table}.*role_id.*permission_id'
-        else:
-            pattern = rf'INSERT INTO {table}.*{check_value}'
-        
-        if re.search(pattern, content, re.IGNORECASE):
-            print(f"   ✅ {table} sample data found")
+    for table, fragments in sample_data_checks:
+        value_re = _value_re(fragments)
+        if any(value_re.search(body) for body in schema['inserts'].get(table, [])):
+            out.append(f"   ✅ {table} sample data found")
             validation_results.append(True)
         else:
-            print(f"   ❌ {table} sample data missing")
+            out.append(f"   ❌ {table} sample data missing")
             validation_results.append(False)
     
     # Summary
-    print(f"\n=== VALIDATION SUMMARY ===")
+    out.append(f"\n=== VALIDATION SUMMARY ===")
     passed = sum(validation_results)
     total = len(validation_results)
     success_rate = (passed / total) * 100
     
-    print(f"Tests passed: {passed}/{total} ({success_rate:.1f}%)")
+    out.append(f"Tests passed: {passed}/{total} ({success_rate:.1f}%)")
     
     if success_rate == 100:
-        print("🎉 PERMISSION SYSTEM FULLY IMPLEMENTED!")
-        print("✅ All tables, functions, indexes, and sample data are present")
-        print("✅ Schema is ready for production use")
+        out.append("🎉 PERMISSION SYSTEM FULLY IMPLEMENTED!")
+        out.append("✅ All tables, functions, indexes, and sample data are present")
+        out.append("✅ Schema is ready for production use")
         return True
     elif success_rate >= 80:
-        print("⚠️  PERMISSION SYSTEM MOSTLY COMPLETE")  
-        print("✅ Core functionality is implemented")
-        print("⚠️  Some optional components may be missing")
+        out.append("⚠️  PERMISSION SYSTEM MOSTLY COMPLETE")  
+        out.append("✅ Core functionality is implemented")
+        out.append("⚠️  Some optional components may be missing")
         return True
     else:
-        print("❌ PERMISSION SYSTEM INCOMPLETE")
-        print("❌ Critical components are missing")
-        print("❌ Additional work needed before production use")
+        out.append("❌ PERMISSION SYSTEM INCOMPLETE")
+        out.append("❌ Critical components are missing")
+        out.append("❌ Additional work needed before production use")
+        return False
+
+def validate(schema):
+    """Check a parsed schema, returning (passed, report text)"""
+    out = ["=== PERMISSION SYSTEM SCHEMA VALIDATION ===\n"]
+    passed = _validate_permission_system(schema, out)
+    return passed, '\n'.join(out)
+
+def validate_permission_system(schema_file_path):
+    """Validate the permission system implementation in the schema file"""
+    try:
+        schema = load_schema(schema_file_path)
+    except FileNotFoundError:
+        print("=== PERMISSION SYSTEM SCHEMA VALIDATION ===\n")
+        print(f"❌ Schema file not found: {schema_file_path}")
         return False
+    
+    passed, report = validate(schema)
+    sys.stdout.write(report + '\n')
+    return passed
 
 if __name__ == "__main__":
     schema_path = "my.sql"
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Validation Runner
+Parses the schema once and runs the independent validators in parallel worker processes
+"""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# The permission validator lives in a sibling directory; it is put on the path at
+# module level so spawned workers can import it as well
+sys.path.append(str(Path(__file__).resolve().parent.parent / "Permission System"))
+
+import schema_check
+import validate_dependencies
+import validate_permission_system
+from schema_model import load
+
+def main():
+    schema_path = sys.argv[1] if len(sys.argv) > 1 else "my.sql"
+
+    if not Path(schema_path).exists():
+        print(f"❌ Schema file {schema_path} not found!")
+        return 1
+
+    # Each validator receives an already parsed model, pickled to its worker
+    model = load(schema_path)
+    jobs = [
+        (schema_check.validate, model),
+        (validate_dependencies.validate, model),
+        (validate_permission_system.validate, validate_permission_system.load_schema(schema_path)),
+    ]
+
+    with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = [executor.submit(validate, parsed) for validate, parsed in jobs]
+        results = [future.result() for future in futures]
+
+    # Reports are printed in a fixed order once every worker has finished
+    for passed, report in results:
+        print(report)
+        print()
+
+    passed_count = sum(passed for passed, _ in results)
+    all_passed = passed_count == len(results)
+    print(f"{'🎉' if all_passed else '❌'} {passed_count}/{len(results)} validators passed")
+
+    return 0 if all_passed else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,84 +4,89 @@ Schema Structure Validator
 Checks for duplicate table definitions and dependency issues in the PostgreSQL schema
 """
 
-import re
+import sys
+from collections import Counter
 from pathlib import Path
 
-def check_schema_structure(file_path: str):
-    """Check the PostgreSQL schema for structural issues"""
-    
-    with open(file_path, 'r') as f:
-        content = f.read()
+from schema_model import load
+
+def _check_schema_structure(model, out):
+    """Run the structure checks, appending report lines to out"""
     
-    print("🔍 PostgreSQL Schema Structure Checker")
-    print("=" * 50)
+    out.append("🔍 PostgreSQL Schema Structure Checker")
+    out.append("=" * 50)
     
     # Check for table definitions
-    table_pattern = r'CREATE TABLE.*?(\w+)\s*\('
-    tables = re.findall(table_pattern, content, re.IGNORECASE | re.DOTALL)
+    tables = model.tables
+    
+    stripped_tables = [table.strip() for table in tables]
     
-    print(f"📊 Found {len(tables)} table definitions:")
-    table_counts = {}
-    for table in tables:
-        table_name = table.strip()
-        if table_name in table_counts:
-            table_counts[table_name] += 1
-        else:
-            table_counts[table_name] = 1
-        print(f"   • {table_name}")
+    out.append(f"📊 Found {len(tables)} table definitions:")
+    for table_name in stripped_tables:
+        out.append(f"   • {table_name}")
+    table_counts = Counter(stripped_tables)
     
     # Check for duplicates
     duplicates = {name: count for name, count in table_counts.items() if count > 1}
     if duplicates:
-        print(f"\n❌ DUPLICATE TABLES FOUND:")
+        out.append(f"\n❌ DUPLICATE TABLES FOUND:")
         for name, count in duplicates.items():
-            print(f"   • {name}: {count} definitions")
+            out.append(f"   • {name}: {count} definitions")
         return False
     else:
-        print(f"\n✅ No duplicate tables found")
+        out.append(f"\n✅ No duplicate tables found")
     
     # Check for foreign key dependencies
-    fk_pattern = r'FOREIGN KEY.*?REFERENCES\s+(\w+)'
-    foreign_keys = re.findall(fk_pattern, content, re.IGNORECASE)
+    foreign_keys = model.foreign_keys
+    fk_set = set(foreign_keys)
     
-    print(f"\n🔗 Found {len(foreign_keys)} foreign key references:")
-    for fk in set(foreign_keys):
-        print(f"   • References: {fk}")
+    out.append(f"\n🔗 Found {len(foreign_keys)} foreign key references:")
+    for fk in fk_set:
+        out.append(f"   • References: {fk}")
     
     # Check if referenced tables exist
-    missing_refs = []
-    for fk_table in set(foreign_keys):
-        if fk_table not in [t.strip() for t in tables]:
-            missing_refs.append(fk_table)
+    table_set = set(stripped_tables)
+    missing_refs = [fk for fk in fk_set if fk not in table_set]
     
     if missing_refs:
-        print(f"\n❌ MISSING REFERENCED TABLES:")
+        out.append(f"\n❌ MISSING REFERENCED TABLES:")
         for ref in missing_refs:
-            print(f"   • {ref}")
+            out.append(f"   • {ref}")
         return False
     else:
-        print(f"\n✅ All foreign key references are valid")
+        out.append(f"\n✅ All foreign key references are valid")
     
     # Check for type definitions
-    type_pattern = r'CREATE TYPE\s+(\w+)'
-    types = re.findall(type_pattern, content, re.IGNORECASE)
-    print(f"\n📝 Found {len(types)} custom types:")
+    types = model.types
+    out.append(f"\n📝 Found {len(types)} custom types:")
     for type_name in types:
-        print(f"   • {type_name}")
+        out.append(f"   • {type_name}")
     
     # Summary
-    print(f"\n📋 SCHEMA SUMMARY:")
-    print(f"   • Tables: {len(set(tables))}")
-    print(f"   • Custom Types: {len(types)}")
-    print(f"   • Foreign Keys: {len(foreign_keys)}")
+    out.append(f"\n📋 SCHEMA SUMMARY:")
+    out.append(f"   • Tables: {len(set(tables))}")
+    out.append(f"   • Custom Types: {len(types)}")
+    out.append(f"   • Foreign Keys: {len(foreign_keys)}")
     
     if not duplicates and not missing_refs:
-        print(f"\n🎉 Schema structure validation PASSED!")
+        out.append(f"\n🎉 Schema structure validation PASSED!")
         return True
     else:
-        print(f"\n💥 Schema structure validation FAILED!")
+        out.append(f"\n💥 Schema structure validation FAILED!")
         return False
 
+def validate(model):
+    """Check a parsed SchemaModel, returning (passed, report text)"""
+    out = []
+    passed = _check_schema_structure(model, out)
+    return passed, '\n'.join(out)
+
+def check_schema_structure(file_path: str):
+    """Check the PostgreSQL schema for structural issues"""
+    passed, report = validate(load(file_path))
+    sys.stdout.write(report + '\n')
+    return passed
+
 if __name__ == "__main__":
     print("Starting schema check...")
     schema_file = Path(__file__).parent / "my.sql"
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Shared Schema Model
+Parses the PostgreSQL schema once and caches the result on disk so the
+validator scripts do not each re-read and re-scan the same file.
+"""
+
+import json
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    # Faster drop-in for re when installed
+    import regex as re
+except ImportError:
+    import re
+
+# Bump whenever parsing changes so stale cache files are ignored
+CACHE_VERSION = 7
+
+FOREIGN_KEY_PATTERN = r'FOREIGN KEY\s*\([^)]*\)\s*REFERENCES\s+(?P<reference>\w+)'
+
+# Every statement-level event is found by one finditer per line. CREATE TABLE is
+# anchored at the start of the stripped line so each attempt is bounded to a
+# few characters. It must be followed by its column list so CREATE TABLE ...
+# AS SELECT is not counted; a name ending the line is confirmed by the next line.
+TOP_EVENT_RE = re.compile(
+    r'^CREATE TABLE\s+(?:IF NOT EXISTS\s+)?(?P<table>\w+)\s*(?:(?P<columns>\()|$)'
+    r'|CREATE(?P<replace>\s+OR REPLACE)?\s+FUNCTION\s+(?P<function>\w+)'
+    r'|CREATE TYPE\s+(?P<type>\w+)'
+    r'|' + FOREIGN_KEY_PATTERN,
+    re.IGNORECASE
+)
+FOREIGN_KEY_RE = re.compile(FOREIGN_KEY_PATTERN, re.IGNORECASE)
+# Dollar-quote delimiters such as $$, $body$ or $function$; captures the tag
+DOLLAR_TAG_RE = re.compile(r'\$((?:[A-Za-z_]\w*)?)\$')
+
+# Cheap literal prefilter checked before any regex runs on a line. Only the
+# first ten characters are upper-cased since that covers every prefix.
+TOP_PREFIXES = ('CREATE', 'FOREIGN', 'ALTER', 'ADD', 'CONSTRAINT', 'DO')
+
+# Parser states
+TOP = 'TOP'
+PENDING_TABLE = 'PENDING_TABLE'
+IN_TABLE = 'IN_TABLE'
+IN_FUNCTION = 'IN_FUNCTION'
+
+@dataclass
+class SchemaModel:
+    """Structural facts extracted from a schema file"""
+    tables: list = field(default_factory=list)           # In definition order, duplicates kept
+    types: list = field(default_factory=list)
+    functions: list = field(default_factory=list)
+    plain_functions: list = field(default_factory=list)  # Defined without OR REPLACE
+    foreign_keys: list = field(default_factory=list)     # Referenced table names
+    dependencies: dict = field(default_factory=dict)     # Table -> {'dependencies', 'line_num'}
+
+class SchemaParser:
+    """Line-at-a-time schema parser
+
+    Feed the schema one line at a time and read the result from `model`.
+    At TOP only statement-level patterns are tried; inside a CREATE TABLE
+    body only foreign keys are collected until the closing semicolon, and
+    dollar-quoted function bodies are skipped entirely.
+    """
+
+    def __init__(self):
+        self.model = SchemaModel()
+        self.state = TOP
+        self.current_table = None
+        self.pending_table = None  # (name, line_num) awaiting its column list
+        self.dollar_tag = None  # Tag of the open dollar-quoted body, if any
+        self.nonempty_count = 0
+
+    def feed(self, line):
+        line = line.strip()
+        if not line:
+            return
+        self.nonempty_count += 1
+        # Drop trailing comments so statement ends can be seen with endswith(';')
+        line = _strip_comment(line)
+        if not line:
+            return
+
+        if self.state == PENDING_TABLE:
+            self._feed_pending(line)
+        elif self.state == IN_TABLE:
+            self._feed_table(line)
+        elif self.state == IN_FUNCTION:
+            self._feed_function(line)
+        else:
+            self._feed_top(line)
+
+    def _feed_top(self, line):
+        if not line[:10].upper().startswith(TOP_PREFIXES):
+            return
+        model = self.model
+
+        for event in TOP_EVENT_RE.finditer(line):
+            if event.group('table'):
+                table = (event.group('table'), self.nonempty_count - 1)
+                if event.group('columns'):
+                    # Constraints may share the line with CREATE TABLE
+                    self._start_table(table, line[event.end():])
+                else:
+                    self.pending_table = table
+                    self.state = PENDING_TABLE
+                return
+
+            if event.group('function'):
+                model.functions.append(event.group('function'))
+                if not event.group('replace'):
+                    model.plain_functions.append(event.group('function'))
+                self.state = IN_FUNCTION
+                self.dollar_tag = None
+                self._feed_function(line)
+                return
+
+            if event.group('type'):
+                model.types.append(event.group('type'))
+            else:
+                # Constraints added later through ALTER TABLE
+                model.foreign_keys.append(event.group('reference'))
+
+    def _start_table(self, table, text):
+        """Record a table whose column list begins in text"""
+        self.current_table, line_num = table
+        self.model.tables.append(self.current_table)
+        self.model.dependencies[self.current_table] = {
+            'dependencies': [],
+            'line_num': line_num
+        }
+        self._record_foreign_keys(text)
+        self.state = TOP if text.endswith(';') else IN_TABLE
+
+    def _feed_pending(self, line):
+        table, self.pending_table = self.pending_table, None
+        if line.startswith('('):
+            self._start_table(table, line)
+        else:
+            # Not a column list, e.g. AS SELECT on the line after the name
+            self.state = TOP
+            self._feed_top(line)
+
+    def _record_foreign_keys(self, text):
+        for referenced_table in FOREIGN_KEY_RE.findall(text):
+            self.model.foreign_keys.append(referenced_table)
+            if referenced_table != self.current_table:  # Avoid self-references
+                self.model.dependencies[self.current_table]['dependencies'].append(referenced_table)
+
+    def _feed_table(self, line):
+        # Column definitions make up most of a table body and never match. The
+        # clause is searched for anywhere so leading commas and constraints
+        # sharing a line are still seen.
+        if 'FOREIGN KEY' in line.upper():
+            self._record_foreign_keys(line)
+        if line.endswith(';'):
+            self.state = TOP
+
+    def _feed_function(self, line):
+        # A body closes only at the same tag that opened it
+        for tag in DOLLAR_TAG_RE.findall(line):
+            if self.dollar_tag is None:
+                self.dollar_tag = tag
+            elif tag == self.dollar_tag:
+                self.dollar_tag = None
+        # Outside the body a semicolon ends the CREATE FUNCTION statement
+        if self.dollar_tag is None and line.endswith(';'):
+            self.state = TOP
+
+def _strip_comment(line):
+    """Remove a trailing -- comment that is not inside a string literal"""
+    if '--' not in line:
+        return line
+    in_string = False
+    for i, char in enumerate(line):
+        if char == "'":
+            in_string = not in_string
+        elif not in_string and line.startswith('--', i):
+            return line[:i].rstrip()
+    return line
+
+def extract_table_definitions(sql_content):
+    """Extract table names and their foreign key dependencies from SQL content."""
+    return parse_schema(sql_content).dependencies
+
+def parse_schema(sql_content):
+    """Build a SchemaModel from the full schema text"""
+    parser = SchemaParser()
+    for line in sql_content.split('\n'):
+        parser.feed(line)
+    return parser.model
+
+def _cache_path(path):
+    return path.with_name(f".{path.name}.cache.pkl")
+
+@lru_cache(maxsize=1)
+def load(path):
+    """Return the SchemaModel for path, reusing the on-disk cache while the file is unchanged"""
+    path = Path(path)
+    stat = path.stat()
+    key = [CACHE_VERSION, stat.st_size, stat.st_mtime_ns]
+    cache_path = _cache_path(path)
+
+    # The key is a JSON header line, so a stale cache is rejected without
+    # unpickling anything. A matching cache is unpickled, which trusts the
+    # cache file as much as the schema and scripts beside it.
+    try:
+        with open(cache_path, 'rb') as f:
+            if json.loads(f.readline()) == key:
+                return pickle.load(f)
+    except Exception:
+        pass  # Missing, stale or corrupt caches are rebuilt below
+
+    parser = SchemaParser()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parser.feed(line)
+    model = parser.model
+
+    # Write to a temporary file and rename it into place so a concurrent run
+    # never reads a partially written cache
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json.dumps(key).encode('ascii') + b'\n')
+                pickle.dump(model, f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass  # Read-only checkouts simply go without the cache
+
+    return model
@@ -4,48 +4,64 @@ Schema Dependency Validator
 Validates that tables are created in the correct order based on foreign key dependencies.
 """
 
-import re
+import heapq
 import sys
 
-def extract_table_definitions(sql_content):
-    """Extract table names and their foreign key dependencies from SQL content."""
-    tables = {}
-    current_table = None
+# extract_table_definitions is re-exported so existing imports keep working
+from schema_model import extract_table_definitions, load
+
+def _reachable(start, edges):
+    """Return every table reachable from start by following edges"""
+    seen = set()
+    stack = list(edges[start])
+    while stack:
+        table_name = stack.pop()
+        if table_name not in seen:
+            seen.add(table_name)
+            stack.extend(edges[table_name])
+    return seen
+
+def topological_order(tables, positions):
+    """Order tables so each follows the tables it references (Kahn's algorithm).
     
-    # Pattern to match CREATE TABLE statements
-    create_table_pattern = r'CREATE TABLE IF NOT EXISTS (\w+)'
-    # Pattern to match FOREIGN KEY constraints
-    foreign_key_pattern = r'FOREIGN KEY \([^)]+\) REFERENCES (\w+)\('
+    positions maps each table name to its index in the file. Returns
+    (order, cyclic) where cyclic lists the tables that take part in a
+    dependency cycle. Ready tables are taken in file order, so a correctly
+    ordered file yields its own order back.
+    """
+    indegree = dict.fromkeys(tables, 0)
+    dependents = {name: [] for name in tables}
     
-    lines = sql_content.split('\n')
+    for table_name, table_info in tables.items():
+        # Undefined references are reported by validate_dependencies
+        for dependency in set(table_info['dependencies']) & positions.keys():
+            dependents[dependency].append(table_name)
+            indegree[table_name] += 1
     
-    for line in lines:
-        line = line.strip()
-        
-        # Check for CREATE TABLE
-        create_match = re.search(create_table_pattern, line, re.IGNORECASE)
-        if create_match:
-            current_table = create_match.group(1)
-            tables[current_table] = {
-                'dependencies': [],
-                'line_num': len([l for l in lines[:lines.index(line)] if l.strip()])
-            }
-            continue
-            
-        # Check for FOREIGN KEY within current table
-        if current_table:
-            fk_match = re.search(foreign_key_pattern, line, re.IGNORECASE)
-            if fk_match:
-                referenced_table = fk_match.group(1)
-                if referenced_table != current_table:  # Avoid self-references
-                    tables[current_table]['dependencies'].append(referenced_table)
+    ready = [positions[name] for name, degree in indegree.items() if degree == 0]
+    heapq.heapify(ready)
+    table_order = list(tables)
+    order = []
+    while ready:
+        table_name = table_order[heapq.heappop(ready)]
+        order.append(table_name)
+        for dependent in dependents[table_name]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                heapq.heappush(ready, positions[dependent])
     
-    return tables
+    # Tables left over either sit on a cycle or only depend on one; keep the
+    # ones that can reach themselves again
+    leftover = {name for name, degree in indegree.items() if degree > 0}
+    edges = {name: set(tables[name]['dependencies']) & leftover for name in leftover}
+    cyclic = [name for name in tables if name in leftover and name in _reachable(name, edges)]
+    return order, cyclic
 
 def validate_dependencies(tables):
     """Validate that tables are defined before they are referenced."""
     errors = []
     table_order = list(tables.keys())
+    positions = {name: i for i, name in enumerate(table_order)}
     
     for i, table_name in enumerate(table_order):
         table_info = tables[table_name]
@@ -56,54 +72,80 @@ def validate_dependencies(tables):
                 continue
                 
             # Check if dependency appears later in the file
-            dependency_index = table_order.index(dependency) if dependency in table_order else -1
+            dependency_index = positions[dependency]
             if dependency_index > i:
                 errors.append(f"Dependency error: Table '{table_name}' (position {i+1}) references table '{dependency}' (position {dependency_index+1}) which is defined later")
     
+    _, cyclic = topological_order(tables, positions)
+    if cyclic:
+        errors.append(f"Circular dependency between tables: {', '.join(cyclic)}")
+    
     return errors
 
-def main():
-    try:
-        with open('my.sql', 'r', encoding='utf-8') as f:
-            sql_content = f.read()
-    except FileNotFoundError:
-        print("Error: my.sql file not found")
-        sys.exit(1)
+def _report_dependencies(tables, out):
+    """Validate table order, appending report lines to out"""
+    out.append("=== Schema Dependency Validation ===")
+    out.append("")
     
-    print("=== Schema Dependency Validation ===")
-    print()
-    
-    # Extract table definitions
-    tables = extract_table_definitions(sql_content)
-    
-    print(f"Found {len(tables)} tables:")
+    out.append(f"Found {len(tables)} tables:")
     for i, (table_name, info) in enumerate(tables.items()):
         deps_str = ", ".join(info['dependencies']) if info['dependencies'] else "none"
-        print(f"  {i+1:2d}. {table_name:<20} -> depends on: {deps_str}")
+        out.append(f"  {i+1:2d}. {table_name:<20} -> depends on: {deps_str}")
     
-    print()
+    out.append("")
     
     # Validate dependencies
     errors = validate_dependencies(tables)
     
     if errors:
-        print("❌ VALIDATION FAILED")
-        print("Dependency errors found:")
+        out.append("❌ VALIDATION FAILED")
+        out.append("Dependency errors found:")
         for error in errors:
-            print(f"  • {error}")
-        sys.exit(1)
-    else:
-        print("✅ VALIDATION PASSED")
-        print("All tables are defined in correct dependency order!")
+            out.append(f"  • {error}")
         
-        # Check specific case that was causing the error
-        if 'employees' in tables and 'roles' in tables:
-            employee_pos = list(tables.keys()).index('employees')
-            roles_pos = list(tables.keys()).index('roles')
-            if roles_pos < employee_pos:
-                print("✅ Specific fix confirmed: 'roles' table is defined before 'employees' table")
-            else:
-                print("❌ Issue still exists: 'roles' table should be defined before 'employees' table")
+        # Only suggest an order when one exists and it differs from the file's
+        table_order = list(tables)
+        positions = {name: i for i, name in enumerate(table_order)}
+        suggested_order, cyclic = topological_order(tables, positions)
+        if not cyclic and suggested_order != table_order:
+            out.append("")
+            out.append("Suggested creation order:")
+            for i, table_name in enumerate(suggested_order):
+                out.append(f"  {i+1:2d}. {table_name}")
+        return False
+    
+    out.append("✅ VALIDATION PASSED")
+    out.append("All tables are defined in correct dependency order!")
+    
+    # Check specific case that was causing the error
+    if 'employees' in tables and 'roles' in tables:
+        table_order = list(tables)
+        employee_pos = table_order.index('employees')
+        roles_pos = table_order.index('roles')
+        if roles_pos < employee_pos:
+            out.append("✅ Specific fix confirmed: 'roles' table is defined before 'employees' table")
+        else:
+            out.append("❌ Issue still exists: 'roles' table should be defined before 'employees' table")
+    return True
+
+def validate(model):
+    """Check a parsed SchemaModel, returning (passed, report text)"""
+    out = []
+    # Table definitions are extracted by the shared schema model
+    passed = _report_dependencies(model.dependencies, out)
+    return passed, '\n'.join(out)
+
+def main():
+    try:
+        model = load('my.sql')
+    except FileNotFoundError:
+        print("Error: my.sql file not found")
+        sys.exit(1)
+    
+    passed, report = validate(model)
+    print(report)
+    if not passed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -4,30 +4,49 @@ PostgreSQL Schema Validation Script
 Validates SQL syntax and checks for common issues without requiring a live database.
 """
 
-import re
 import sys
+from collections import Counter
 from pathlib import Path
 
-def validate_sql_syntax(sql_content):
+try:
+    import regex as re
+except ImportError:
+    import re
+
+from schema_model import load
+
+# One scan counts every component kind
+COMPONENT_RE = re.compile(
+    r'CREATE\s+(?:OR REPLACE\s+)?(?:UNIQUE\s+|MATERIALIZED\s+)?(TABLE|INDEX|FUNCTION|VIEW)\b',
+    re.IGNORECASE
+)
+
+def validate_sql_syntax(sql_content, model):
     """Basic SQL syntax validation"""
     errors = []
     warnings = []
     
     # Check for basic syntax issues
-    lines = sql_content.split('\n')
+    lines = [l.strip() for l in sql_content.split('\n')]
+    in_create_table = False
     
     for i, line in enumerate(lines, 1):
-        line = line.strip()
         if not line or line.startswith('--'):
             continue
+        
+        if 'CREATE TABLE' in line:
+            in_create_table = True
             
         # Check for common syntax errors
-        if line.endswith(',') and 'CREATE TABLE' in lines[max(0, i-10):i]:
+        if in_create_table and line.endswith(','):
             # Check if this is the last column definition
-            remaining_lines = [l.strip() for l in lines[i:i+5] if l.strip() and not l.strip().startswith('--')]
-            if remaining_lines and remaining_lines[0].startswith(');'):
+            next_line = next((l for l in lines[i:i+5] if l and not l.startswith('--')), None)
+            if next_line and next_line.startswith(');'):
                 errors.append(f"Line {i}: Trailing comma before closing parenthesis: {line}")
         
+        if line.endswith(';'):
+            in_create_table = False
+        
         # Check for unmatched parentheses in CREATE statements
         if 'CREATE TABLE' in line or 'CREATE INDEX' in line:
             open_parens = line.count('(')
@@ -37,26 +56,23 @@ def validate_sql_syntax(sql_content):
                 pass
     
     # Check for type conflicts
-    type_definitions = re.findall(r'CREATE TYPE\s+(\w+)', sql_content, re.IGNORECASE)
-    if len(type_definitions) != len(set(type_definitions)):
-        duplicates = [t for t in type_definitions if type_definitions.count(t) > 1]
-        errors.append(f"Duplicate type definitions found: {set(duplicates)}")
+    duplicates = {t for t, count in Counter(model.types).items() if count > 1}
+    if duplicates:
+        errors.append(f"Duplicate type definitions found: {duplicates}")
     
     # Check for table conflicts  
-    table_definitions = re.findall(r'CREATE TABLE(?:\s+IF NOT EXISTS)?\s+(\w+)', sql_content, re.IGNORECASE)
-    if len(table_definitions) != len(set(table_definitions)):
-        duplicates = [t for t in table_definitions if table_definitions.count(t) > 1]
-        errors.append(f"Duplicate table definitions found: {set(duplicates)}")
+    duplicates = {t for t, count in Counter(model.tables).items() if count > 1}
+    if duplicates:
+        errors.append(f"Duplicate table definitions found: {duplicates}")
     
     # Check for function conflicts
-    function_definitions = re.findall(r'CREATE(?:\s+OR REPLACE)?\s+FUNCTION\s+(\w+)', sql_content, re.IGNORECASE)
-    regular_functions = re.findall(r'CREATE\s+FUNCTION\s+(\w+)', sql_content, re.IGNORECASE)
+    regular_functions = model.plain_functions
     if regular_functions:
         warnings.append(f"Functions without OR REPLACE found: {regular_functions}. Consider using CREATE OR REPLACE.")
     
     return errors, warnings
 
-def check_schema_completeness(sql_content):
+def check_schema_completeness(sql_content, model):
     """Check if schema has required components for POS system"""
     required_tables = [
         'products', 'product_variations', 'categories', 'orders',
@@ -64,10 +80,8 @@ def check_schema_completeness(sql_content):
         'currencies', 'exchange_rates'
     ]
     
-    missing_tables = []
-    for table in required_tables:
-        if not re.search(f'CREATE TABLE.*{table}', sql_content, re.IGNORECASE):
-            missing_tables.append(table)
+    defined_tables = {name.lower() for name in model.tables}
+    missing_tables = [table for table in required_tables if table not in defined_tables]
     
     # Check for multi-currency support
     has_currency_support = 'currency_code' in sql_content and 'exchange_rates' in sql_content
@@ -91,15 +105,16 @@ def main():
     print("🔍 Validating PostgreSQL POS Schema...")
     print("=" * 50)
     
-    # Read schema file
+    # Read schema file; extracted definitions come from the shared schema model
     with open(schema_file, 'r', encoding='utf-8') as f:
         sql_content = f.read()
+    model = load(schema_file)
     
     # Validate syntax
-    errors, warnings = validate_sql_syntax(sql_content)
+    errors, warnings = validate_sql_syntax(sql_content, model)
     
     # Check completeness
-    completeness = check_schema_completeness(sql_content)
+    completeness = check_schema_completeness(sql_content, model)
     
     # Report results
     print(f"📄 Schema file size: {len(sql_content)} characters")
@@ -128,16 +143,13 @@ def main():
     print(f"  {'✅' if completeness['has_functions'] else '❌'} Helper functions: {'Yes' if completeness['has_functions'] else 'No'}")
     
     # Count key components
-    table_count = len(re.findall(r'CREATE TABLE', sql_content, re.IGNORECASE))
-    index_count = len(re.findall(r'CREATE.*INDEX', sql_content, re.IGNORECASE))
-    function_count = len(re.findall(r'CREATE.*FUNCTION', sql_content, re.IGNORECASE))
-    view_count = len(re.findall(r'CREATE.*VIEW', sql_content, re.IGNORECASE))
+    component_counts = Counter(m.group(1).upper() for m in COMPONENT_RE.finditer(sql_content))
     
     print(f"\n📈 COMPONENT COUNTS:")
-    print(f"  • Tables: {table_count}")
-    print(f"  • Indexes: {index_count}")
-    print(f"  • Functions: {function_count}")
-    print(f"  • Views: {view_count}")
+    print(f"  • Tables: {component_counts['TABLE']}")
+    print(f"  • Indexes: {component_counts['INDEX']}")
+    print(f"  • Functions: {component_counts['FUNCTION']}")
+    print(f"  • Views: {component_counts['VIEW']}")
     
     # Final assessment
     is_valid = len(errors) == 0 and len(completeness['missing_tables']) == 0